@@ -2,25 +2,49 @@
 Admin routes for managing AWS credentials.
 Allows admins to configure per-team or global AWS credentials.
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+import asyncio
+from datetime import datetime
+from functools import lru_cache
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import bindparam, exists, select
+from sqlalchemy.orm import Session, load_only, raiseload
+from typing import Optional
 
 from auth.auth import get_current_user
-from database import get_db
+from database import get_db, upsert
 from models import User, AWSCredentials, Team
 from schemas import (
+    Page,
     AWSCredentialsCreate,
     AWSCredentialsResponse,
     AWSCredentialsTestResult
 )
-from utils.encryption import encrypt_credential, decrypt_credential
+from utils.encryption import encrypt_many, decrypt_credential
+from utils.http_cache import collection_etag, not_modified
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page
 
 aws_credentials_router = APIRouter(
     prefix="/api/v1/admin/aws-credentials",
     tags=["Admin - AWS Credentials"]
 )
 
+# Columns of AWSCredentialsResponse; read endpoints never load the
+# encrypted secrets
+_response_columns = load_only(*(getattr(AWSCredentials, field) for field in AWSCredentialsResponse.model_fields))
+
+# Built once; each lookup only binds the team id
+_active_team_credentials = select(AWSCredentials).options(_response_columns).where(
+    AWSCredentials.team_id == bindparam("team_id"),
+    AWSCredentials.is_active == True
+)
+
+
+@lru_cache(maxsize=1)
+def _boto_session():
+    """Shared boto3 session so each test call doesn't reload service models."""
+    import boto3
+    return boto3.session.Session()
+
 
 def require_admin(current_user: User = Depends(get_current_user)):
     """Dependency to ensure user is admin."""
@@ -29,18 +53,25 @@ def require_admin(current_user: User = Depends(get_current_user)):
     return current_user
 
 
-@aws_credentials_router.get("", response_model=List[AWSCredentialsResponse])
+@aws_credentials_router.get("", response_model=Page[AWSCredentialsResponse])
 def list_aws_credentials(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     """
     List all configured AWS credentials (no secrets exposed).
     """
-    credentials = db.query(AWSCredentials).filter(
+    query = db.query(AWSCredentials).options(_response_columns, raiseload("*")).filter(
         AWSCredentials.is_active == True
-    ).all()
-    return credentials
+    )
+    cached = not_modified(request, response, collection_etag(query, AWSCredentials.updated_at))
+    if cached:
+        return cached
+    return keyset_page(query, AWSCredentials.id, limit, cursor)
 
 
 @aws_credentials_router.get("/{team_id}", response_model=AWSCredentialsResponse)
@@ -52,10 +83,7 @@ def get_team_credentials(
     """
     Get AWS credentials for a specific team.
     """
-    credentials = db.query(AWSCredentials).filter(
-        AWSCredentials.team_id == team_id,
-        AWSCredentials.is_active == True
-    ).first()
+    credentials = db.scalars(_active_team_credentials, {"team_id": team_id}).first()
 
     if not credentials:
         raise HTTPException(status_code=404, detail="Credentials not found for this team")
@@ -76,63 +104,59 @@ def create_or_update_credentials(
     """
     # Validate team exists if team_id provided
     if credentials_data.team_id:
-        team = db.query(Team).filter(Team.id == credentials_data.team_id).first()
-        if not team:
+        if not db.scalar(select(exists().where(Team.id == credentials_data.team_id))):
             raise HTTPException(status_code=404, detail="Team not found")
 
-    # Check if credentials already exist
-    existing = db.query(AWSCredentials).filter(
-        AWSCredentials.team_id == credentials_data.team_id
-    ).first()
-
-    if existing:
-        # Update existing credentials
-        existing.aws_access_key_id_encrypted = encrypt_credential(
-            credentials_data.aws_access_key_id
+    access_key, secret_key, session_token = encrypt_many([
+        credentials_data.aws_access_key_id,
+        credentials_data.aws_secret_access_key,
+        credentials_data.aws_session_token or "",
+    ])
+    values = {
+        "aws_access_key_id_encrypted": access_key,
+        "aws_secret_access_key_encrypted": secret_key,
+        "aws_session_token_encrypted": session_token or None,
+        "aws_region": credentials_data.aws_region,
+        "is_active": True,
+    }
+
+    # Global credentials have a NULL team_id, which never conflicts on the
+    # unique index, so the single global row is still updated in place.
+    if credentials_data.team_id is None:
+        existing = db.query(AWSCredentials).filter(
+            AWSCredentials.team_id.is_(None)
+        ).first()
+        if existing:
+            for key, value in values.items():
+                setattr(existing, key, value)
+            db.commit()
+            db.refresh(existing)
+            return existing
+
+    # Insert or update in a single statement
+    stmt = (
+        upsert(AWSCredentials)
+        .values(
+            team_id=credentials_data.team_id,
+            created_by=current_user.id,
+            **values
         )
-        existing.aws_secret_access_key_encrypted = encrypt_credential(
-            credentials_data.aws_secret_access_key
+        .on_conflict_do_update(
+            index_elements=[AWSCredentials.team_id],
+            set_={**values, "updated_at": datetime.utcnow()}
         )
-        existing.aws_region = credentials_data.aws_region
-
-        if credentials_data.aws_session_token:
-            existing.aws_session_token_encrypted = encrypt_credential(
-                credentials_data.aws_session_token
-            )
-        else:
-            existing.aws_session_token_encrypted = None
-
-        existing.is_active = True
-        db.commit()
-        db.refresh(existing)
-        return existing
-
-    # Create new credentials
-    new_credentials = AWSCredentials(
-        team_id=credentials_data.team_id,
-        aws_access_key_id_encrypted=encrypt_credential(
-            credentials_data.aws_access_key_id
-        ),
-        aws_secret_access_key_encrypted=encrypt_credential(
-            credentials_data.aws_secret_access_key
-        ),
-        aws_session_token_encrypted=encrypt_credential(
-            credentials_data.aws_session_token
-        ) if credentials_data.aws_session_token else None,
-        aws_region=credentials_data.aws_region,
-        created_by=current_user.id,
-        is_active=True
+        .returning(AWSCredentials)
     )
-
-    db.add(new_credentials)
+    credentials = db.scalars(
+        stmt, execution_options={"populate_existing": True}
+    ).one()
     db.commit()
-    db.refresh(new_credentials)
 
-    return new_credentials
+    return credentials
 
 
 @aws_credentials_router.post("/test", response_model=AWSCredentialsTestResult)
-def test_aws_credentials(
+async def test_aws_credentials(
     credentials_data: AWSCredentialsCreate,
     current_user: User = Depends(require_admin)
 ):
@@ -141,11 +165,11 @@ def test_aws_credentials(
     Does not save credentials to database.
     """
     try:
-        import boto3
         from botocore.exceptions import ClientError
 
-        # Create STS client with provided credentials
-        sts_client = boto3.client(
+        # Create STS client with provided credentials. Sessions are not
+        # thread-safe, so clients are only created here on the event loop.
+        sts_client = _boto_session().client(
             'sts',
             aws_access_key_id=credentials_data.aws_access_key_id,
             aws_secret_access_key=credentials_data.aws_secret_access_key,
@@ -153,8 +177,8 @@ def test_aws_credentials(
             region_name=credentials_data.aws_region
         )
 
-        # Test credentials by getting caller identity
-        response = sts_client.get_caller_identity()
+        # Test credentials by getting caller identity, off the event loop
+        response = await asyncio.to_thread(sts_client.get_caller_identity)
 
         return AWSCredentialsTestResult(
             success=True,
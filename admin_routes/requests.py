@@ -1,36 +1,43 @@
+from celery import chain, group
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, raiseload
 from typing import List, Optional
 
 from database import get_db
 from models import User, ResourceRequest
 from schemas import (
+    Page,
     ResourceRequestResponse,
     ResourceRequestApproval,
+    ResourceRequestBulkApproval,
     ResourceRequestRejection
 )
 from auth.auth import get_current_admin_user
-from celery_app.tasks.terraform_tasks import provision_resource
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page
+from celery_app.tasks.terraform_tasks import prewarm_workspace, provision_resource
 
 admin_request_router = APIRouter(prefix="/api/v1/admin", tags=["Admin Requests"])
 
 
 # 1. GET /requests - View all resource requests (with optional filtering)
-@admin_request_router.get("/requests", response_model=List[ResourceRequestResponse])
+@admin_request_router.get("/requests", response_model=Page[ResourceRequestResponse])
 def view_all_requests(
     status_filter: Optional[str] = Query(None, description="Filter by status: pending, approved, rejected"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
-    query = db.query(ResourceRequest)
+    # ResourceRequestResponse is flat; never lazy-load relationships per row
+    query = db.query(ResourceRequest).options(raiseload("*"))
 
     # Filter by status if provided
     if status_filter:
         query = query.filter(ResourceRequest.status == status_filter)
 
-    # Order by newest first
-    requests = query.order_by(ResourceRequest.created_at.desc()).all()
-    return requests
+    # Newest first; ids increase with creation time
+    return keyset_page(query, ResourceRequest.id, limit, cursor, descending=True)
 
 
 # 2. GET /requests/{id} - Get specific request details
@@ -40,7 +47,7 @@ def get_request(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
-    request = db.query(ResourceRequest).filter(ResourceRequest.id == request_id).first()
+    request = db.get(ResourceRequest, request_id)
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
     return request
@@ -55,7 +62,7 @@ def approve_request(
     current_user: User = Depends(get_current_admin_user)
 ):
     # Find the request
-    request = db.query(ResourceRequest).filter(ResourceRequest.id == request_id).first()
+    request = db.get(ResourceRequest, request_id)
 
     # Check if exists
     if not request:
@@ -82,7 +89,53 @@ def approve_request(
     return request
 
 
-# 4. PUT /requests/{id}/reject - Reject request
+# 4. PUT /requests/approve - Approve several requests at once
+@admin_request_router.put("/requests/approve", response_model=List[ResourceRequestResponse])
+def approve_requests(
+    approval: ResourceRequestBulkApproval,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    request_ids = sorted(set(approval.request_ids))
+    by_ids = select(ResourceRequest).options(raiseload("*")).where(ResourceRequest.id.in_(request_ids))
+
+    # Check all exist and are still pending
+    requests = {request.id: request for request in db.scalars(by_ids)}
+    missing = [request_id for request_id in request_ids if request_id not in requests]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Requests not found: {missing}")
+    processed = [request_id for request_id, request in requests.items() if request.status != "pending"]
+    if processed:
+        raise HTTPException(status_code=400, detail=f"Requests already processed: {processed}")
+
+    by_type = {}
+    for request_id, request in requests.items():
+        by_type.setdefault(request.resource_type, []).append(request_id)
+
+    # Approve all in one UPDATE, only while they are still pending: another
+    # admin may have approved or rejected some since the check above
+    result = db.execute(
+        update(ResourceRequest)
+        .where(ResourceRequest.id.in_(request_ids), ResourceRequest.status == "pending")
+        .values(status="approved", admin_notes=approval.admin_notes)
+    )
+    if result.rowcount != len(request_ids):
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Some requests were processed concurrently; reload and try again")
+    db.commit()
+
+    # Per resource type: initialize the shared Terraform directory once, then
+    # one provisioning task per request, spread across the terraform workers
+    for resource_type, type_ids in by_type.items():
+        chain(
+            prewarm_workspace.si(resource_type),
+            group(provision_resource.si(request_id) for request_id in type_ids)
+        ).apply_async()
+
+    return db.scalars(by_ids).all()
+
+
+# 5. PUT /requests/{id}/reject - Reject request
 @admin_request_router.put("/requests/{request_id}/reject", response_model=ResourceRequestResponse)
 def reject_request(
     request_id: int,
@@ -91,7 +144,7 @@ def reject_request(
     current_user: User = Depends(get_current_admin_user)
 ):
     # Find the request
-    request = db.query(ResourceRequest).filter(ResourceRequest.id == request_id).first()
+    request = db.get(ResourceRequest, request_id)
 
     # Check if exists
     if not request:
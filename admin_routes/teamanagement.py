@@ -1,22 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import exists, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, load_only, raiseload
+from typing import Optional
 
-from auth.auth import get_current_admin_user
+from auth.auth import get_current_admin_user, invalidate_cached_team, invalidate_cached_user
 from database import get_db
 from models import Team, User
-from schemas import TeamCreate, TeamUpdate, TeamResponse, AddMemberRequest, UserResponse
+from schemas import Page, TeamCreate, TeamUpdate, TeamResponse, AddMemberRequest, UserResponse
+from utils.http_cache import collection_etag, not_modified
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page
 
 admin = APIRouter(prefix="/api/v1/admin", tags=["Admin"])
 
+# Columns of UserResponse; listing users never loads password hashes
+_user_columns = load_only(*(getattr(User, field) for field in UserResponse.model_fields))
 
-@admin.get("/users", response_model=List[UserResponse])
+
+@admin.get("/users", response_model=Page[UserResponse])
 def get_all_users(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
-    users = db.query(User).filter(User.is_admin == False).all()
-    return users
+    query = db.query(User).options(_user_columns, raiseload("*")).filter(User.is_admin == False)
+    cached = not_modified(request, response, collection_etag(query, User.updated_at))
+    if cached:
+        return cached
+    return keyset_page(query, User.id, limit, cursor)
 
 
 @admin.post("/teams", response_model=TeamResponse, status_code=status.HTTP_201_CREATED)
@@ -25,12 +39,7 @@ def create_team(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
-    # Check if team already exists
-    existing = db.query(Team).filter(Team.name == teamcreate.name).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Team name already exists")
-
-    # Create new team
+    # Create new team; the unique constraint on name rejects duplicates
     db_team = Team(
         name=teamcreate.name,
         description=teamcreate.description,
@@ -38,19 +47,29 @@ def create_team(
     )
 
     db.add(db_team)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Team name already exists")
     db.refresh(db_team)
     return db_team
 
 
-@admin.get("/teams", response_model=List[TeamResponse])
+@admin.get("/teams", response_model=Page[TeamResponse])
 def get_teams(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
-    # Return all teams
-    teams = db.query(Team).limit(100).offset(0).all()
-    return teams
+    query = db.query(Team).options(raiseload("*"))
+    cached = not_modified(request, response, collection_etag(query, Team.updated_at))
+    if cached:
+        return cached
+    return keyset_page(query, Team.id, limit, cursor)
 
 
 @admin.get("/teams/{team_id}", response_model=TeamResponse)
@@ -60,7 +79,7 @@ def get_by_id(
     current_user: User = Depends(get_current_admin_user)
 ):
     # Fetch team by ID
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team = db.get(Team, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     return team
@@ -73,15 +92,19 @@ def update_team(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
-    team = db.query(Team).filter(Team.id == team_id).first()
+    # Fetch the team and any team already using the new name in one query
+    criteria = Team.id == team_id
+    if details.name is not None:
+        criteria = or_(criteria, Team.name == details.name)
+    teams = db.query(Team).filter(criteria).all()
+
+    team = next((t for t in teams if t.id == team_id), None)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
-    
 
     if details.name is not None:
         # Check if new name already taken by another team
-        existing = db.query(Team).filter(Team.name == details.name, Team.id != team_id).first()
-        if existing:
+        if any(t.id != team_id for t in teams):
             raise HTTPException(status_code=400, detail="Team name already taken")
         team.name = details.name
 
@@ -90,7 +113,7 @@ def update_team(
 
     db.commit()
     db.refresh(team)
-
+    invalidate_cached_team(team_id)
 
     return team
 
@@ -102,13 +125,14 @@ def delete_team(
     current_user: User = Depends(get_current_admin_user)
 ):
     # Fetch team
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team = db.get(Team, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
 
     # Delete team
     db.delete(team)
     db.commit()
+    invalidate_cached_team(team_id)
     return None
 
 
@@ -119,24 +143,30 @@ def add_member_to_team(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
-    # Check team exists
-    team = db.query(Team).filter(Team.id == team_id).first()
-    if not team:
+    # Check team exists, without loading the row
+    if not db.scalar(select(exists().where(Team.id == team_id))):
         raise HTTPException(status_code=404, detail="Team not found")
 
-    # Check user exists
-    user = db.query(User).filter(User.id == member.user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    # Check if already in team
-    if user.team_id == team_id:
-        raise HTTPException(status_code=400, detail="User already in this team")
-
-    # Add user to team
-    user.team_id = team_id
+    # Check all users exist in one round trip
+    user_ids = set(member.user_ids)
+    current_teams = dict(db.execute(
+        select(User.id, User.team_id).where(User.id.in_(user_ids))
+    ).all())
+    missing = sorted(user_ids - current_teams.keys())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Users not found: {missing}")
+
+    # Skip users already in this team
+    to_add = sorted(uid for uid, tid in current_teams.items() if tid != team_id)
+    if not to_add:
+        raise HTTPException(status_code=400, detail="Users already in this team")
+
+    # Add users to team
+    db.execute(update(User).where(User.id.in_(to_add)).values(team_id=team_id))
     db.commit()
-    return {"message": f"User {member.user_id} added to team {team_id}"}
+    for user_id in to_add:
+        invalidate_cached_user(user_id)
+    return {"message": f"Users {to_add} added to team {team_id}"}
 
 
 @admin.delete("/teams/{team_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -147,11 +177,12 @@ def remove_member_from_team(
     current_user: User = Depends(get_current_admin_user)
 ):
     # Find user in this team
-    user = db.query(User).filter(User.id == user_id, User.team_id == team_id).first()
-    if not user:
+    user = db.get(User, user_id)
+    if not user or user.team_id != team_id:
         raise HTTPException(status_code=404, detail="User not found in this team")
 
     # Remove from team
     user.team_id = None
     db.commit()
+    invalidate_cached_user(user.id)
     return None
\ No newline at end of file
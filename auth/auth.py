@@ -1,13 +1,17 @@
 from datetime import datetime, timedelta, timezone
-from typing import Annotated, Optional
+from typing import Annotated, Optional, Tuple
+import hashlib
 import os
+import threading
 
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import Session, defer, joinedload
 
 from database import get_db
 from models import User
@@ -23,7 +27,33 @@ if not SECRET_KEY:
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# New hashes use argon2id with explicit cost parameters (OWASP baseline:
+# 19 MiB, 2 passes). bcrypt hashes from before the switch still verify and
+# are replaced with argon2id on the user's next login.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
+
+# Authenticated users keyed by token hash, so repeat requests with the same
+# token skip the users lookup. Entries are detached snapshots of the row;
+# call invalidate_cached_user() after changing a user.
+USER_CACHE_TTL_SECONDS = 30
+_user_cache = TTLCache(maxsize=10_000, ttl=USER_CACHE_TTL_SECONDS)
+_user_cache_lock = threading.Lock()
+
+# Built once; each lookup only binds the username. The team is joined in so
+# /me/team is answered from the cached snapshot; the password hash is left
+# out of it and raises if anything reads it.
+_user_by_username = (
+    select(User)
+    .options(defer(User.password_hash, raiseload=True), joinedload(User.team))
+    .where(User.username == bindparam("username"))
+)
 
 
 class TokenData(BaseModel):
@@ -31,7 +61,7 @@ class TokenData(BaseModel):
 
 
 def hash_password(password: str) -> str:
-    """Hash a plain password using bcrypt."""
+    """Hash a plain password using argon2id."""
     return pwd_context.hash(password)
 
 
@@ -40,6 +70,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a plain password and, when its hash uses a deprecated scheme or
+    outdated cost, return a replacement hash to store.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -65,6 +103,14 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    cache_key = hashlib.sha256(token.encode()).hexdigest()
+    with _user_cache_lock:
+        cached = _user_cache.get(cache_key)
+    if cached is not None:
+        user, expires_at = cached
+        if expires_at > datetime.now(timezone.utc).timestamp():
+            return user
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -74,13 +120,36 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.username == token_data.username).first()
+    user = db.scalars(_user_by_username, {"username": token_data.username}).first()
     if user is None:
         raise credentials_exception
 
+    # Detach so the snapshot outlives this request's session
+    db.expunge(user)
+    if user.team is not None:
+        db.expunge(user.team)
+    with _user_cache_lock:
+        _user_cache[cache_key] = (user, payload["exp"])
+
     return user
 
 
+def invalidate_cached_user(user_id: int) -> None:
+    """Drop cached snapshots of a user whose row has changed."""
+    with _user_cache_lock:
+        stale = [key for key, (user, _) in _user_cache.items() if user.id == user_id]
+        for key in stale:
+            del _user_cache[key]
+
+
+def invalidate_cached_team(team_id: int) -> None:
+    """Drop cached snapshots of a team's members after the team changed."""
+    with _user_cache_lock:
+        stale = [key for key, (user, _) in _user_cache.items() if user.team_id == team_id]
+        for key in stale:
+            del _user_cache[key]
+
+
 def get_current_admin_user(
     current_user: Annotated[User, Depends(get_current_user)]
 ) -> User:
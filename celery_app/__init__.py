@@ -1,22 +1,13 @@
 from celery import Celery
+from dotenv import load_dotenv
 
-# Create Celery instance with broker URL
-celery_app = Celery(
-    "infrautomater",
-    broker="redis://localhost:6379/0",
-    backend="redis://localhost:6379/0"
-)
+# Workers don't go through main.py; load .env (DATABASE_URL, Redis URLs) here
+load_dotenv()
 
-# Additional configuration
-celery_app.conf.update(
-    task_serializer="json",
-    result_serializer="json",
-    accept_content=["json"],
-    timezone="UTC",
-    enable_utc=True,
-    task_track_started=True,
-    task_time_limit=600,
-)
+# Create Celery instance; broker, backend and worker settings live in
+# celery_config.py
+celery_app = Celery("infrautomater")
+celery_app.config_from_object("celery_app.celery_config")
 
 # Auto-discover tasks in tasks package
-celery_app.autodiscover_tasks(["celery_app.tasks"])
\ No newline at end of file
+celery_app.autodiscover_tasks(["celery_app.tasks"])
@@ -1,10 +1,17 @@
 # Celery Configuration
+# Loaded by celery_app/__init__.py via config_from_object.
+
+import os
 
 # Broker URL (Redis)
-broker_url = "redis://localhost:6379/0"
+broker_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+broker_pool_limit = 50
+broker_connection_retry_on_startup = True
 
-# Result backend (Redis)
-result_backend = "redis://localhost:6379/0"
+# Result backend (Redis, separate DB from the broker so results don't
+# share the broker keyspace)
+result_backend = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/1")
+result_expires = 3600  # 1 hour
 
 # Task serialization
 task_serializer = "json"
@@ -19,6 +26,17 @@ enable_utc = True
 task_track_started = True
 task_time_limit = 600  # 10 minutes max per task
 
-# Retry settings
+# Routing - Terraform runs take minutes: give them their own queue and have
+# workers reserve one job at a time
+task_routes = {
+    "celery_app.tasks.terraform_tasks.provision_resource": {"queue": "terraform"},
+    "celery_app.tasks.terraform_tasks.prewarm_workspace": {"queue": "terraform"},
+    "celery_app.tasks.terraform_tasks.destroy_resource": {"queue": "terraform"},
+    "celery_app.tasks.terraform_tasks.cleanup_workspace": {"queue": "terraform"},
+}
+worker_prefetch_multiplier = 1
+
+# Retry settings - acknowledge only once finished, and redeliver a task
+# whose worker process died mid-run
 task_acks_late = True
 task_reject_on_worker_lost = True
@@ -1 +1 @@
-from .terraform_tasks import provision_resource, destroy_resource
+from .terraform_tasks import provision_resource, prewarm_workspace, destroy_resource, cleanup_workspace
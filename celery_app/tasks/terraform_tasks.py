@@ -1,16 +1,21 @@
+import fcntl
+import hashlib
 import os
-import sys
 import subprocess
-import json
 import logging
 import shutil
 import secrets
-import string
+import signal
+import threading
+from collections import deque
+from contextlib import contextmanager
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import orjson
+from celery.exceptions import SoftTimeLimitExceeded
+from sqlalchemy import update
 
 from celery_app import celery_app
-from database import SessionLocal
+from database import task_session
 from models import ResourceRequest
 
 logger = logging.getLogger(__name__)
@@ -18,60 +23,144 @@ logger = logging.getLogger(__name__)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 TERRAFORM_MODULES_PATH = os.path.join(BASE_DIR, "terraform", "modules")
 TERRAFORM_WORKSPACES_PATH = os.path.join(BASE_DIR, "terraform", "workspaces")
+TERRAFORM_PLUGIN_CACHE_DIR = os.path.join(BASE_DIR, "terraform", ".plugin-cache")
+
+os.makedirs(TERRAFORM_PLUGIN_CACHE_DIR, exist_ok=True)
+
+# Shared provider cache so `terraform init` links providers instead of
+# downloading them for every request. Workspaces start without a lock file,
+# which Terraform >= 1.4 otherwise treats as a reason to bypass the cache.
+_TERRAFORM_ENV = {
+    **os.environ,
+    "TF_PLUGIN_CACHE_DIR": TERRAFORM_PLUGIN_CACHE_DIR,
+    "TF_PLUGIN_CACHE_MAY_BREAK_DEPENDENCY_LOCK_FILE": "true",
+    "TF_IN_AUTOMATION": "1",
+}
 
 DRY_RUN_MODE = True
 
+# Terraform's built-in workspace; commands that act on the shared directory
+# rather than a request select it explicitly
+DEFAULT_WORKSPACE = "default"
 
-@celery_app.task(bind=True, max_retries=3)
-def provision_resource(self, request_id: int):
-    db = SessionLocal()
+TERRAFORM_TIMEOUT_SECONDS = 600
 
-    try:
-        request = db.query(ResourceRequest).filter(ResourceRequest.id == request_id).first()
+# A provisioning run chains up to four Terraform commands (init, workspace
+# new, apply, output), each bounded by TERRAFORM_TIMEOUT_SECONDS, and may
+# first wait for another worker's init. The soft limit lies beyond all of
+# that and records the run as failed; the hard limit is only a backstop.
+PROVISION_SOFT_TIME_LIMIT = 6 * TERRAFORM_TIMEOUT_SECONDS
+PROVISION_TIME_LIMIT = PROVISION_SOFT_TIME_LIMIT + 60
 
-        if not request:
-            logger.error(f"Request {request_id} not found")
-            return {"status": "error", "message": "Request not found"}
+# destroy_resource runs a single command
+DESTROY_TIME_LIMIT = 2 * TERRAFORM_TIMEOUT_SECONDS
 
-        if request.status != "approved":
-            logger.warning(f"Request {request_id} is not approved, skipping")
-            return {"status": "skipped", "message": "Request not approved"}
+# Lines of streamed Terraform output kept in memory for the task result
+TERRAFORM_OUTPUT_TAIL_LINES = 500
 
-        logger.info(f"Starting provisioning for request {request_id}: {request.resource_type}")
+# Commit the intermediate "provisioning" status so dashboards can see a run
+# in progress. Disable to write only the final status.
+TRACK_PROVISIONING_STATUS = True
 
-        request.status = "provisioning"
-        db.commit()
 
-        result = _provision_by_type(request)
+# Fire-and-forget: status is written to the request row, not the result backend
+@celery_app.task(
+    bind=True,
+    max_retries=3,
+    ignore_result=True,
+    soft_time_limit=PROVISION_SOFT_TIME_LIMIT,
+    time_limit=PROVISION_TIME_LIMIT,
+)
+def provision_resource(self, request_id: int):
+    with task_session() as db:
+        admin_notes = None
 
-        if result["success"]:
-            request.status = "provisioned"
-            request.admin_notes = f"{request.admin_notes or ''}\n\nProvisioned successfully:\n{result.get('output', '')}"
-        else:
-            request.status = "failed"
-            request.admin_notes = f"{request.admin_notes or ''}\n\nProvisioning failed:\n{result.get('error', '')}"
+        try:
+            request = db.get(ResourceRequest, request_id)
 
-        db.commit()
+            if not request:
+                logger.error(f"Request {request_id} not found")
+                return {"status": "error", "message": "Request not found"}
 
-        logger.info(f"Provisioning complete for request {request_id}: {request.status}")
-        return {"status": request.status, "request_id": request_id}
+            # A "provisioning" row means this task was redelivered after its
+            # worker died mid-run; Terraform resumes from the workspace state
+            if request.status not in ("approved", "provisioning"):
+                logger.warning(f"Request {request_id} is not approved, skipping")
+                return {"status": "skipped", "message": "Request not approved"}
 
-    except Exception as e:
-        logger.error(f"Error provisioning request {request_id}: {str(e)}")
+            logger.info(f"Starting provisioning for request {request_id}: {request.resource_type}")
 
-        try:
-            request = db.query(ResourceRequest).filter(ResourceRequest.id == request_id).first()
-            if request:
-                request.status = "failed"
-                request.admin_notes = f"{request.admin_notes or ''}\n\nProvisioning error: {str(e)}"
+            admin_notes = request.admin_notes or ''
+
+            if TRACK_PROVISIONING_STATUS:
+                request.status = "provisioning"
                 db.commit()
-        except:
-            pass
 
-        raise self.retry(exc=e, countdown=60)
+            result = _provision_by_type(request)
+
+            if result["success"]:
+                final_status = "provisioned"
+                final_notes = f"{admin_notes}\n\nProvisioned successfully:\n{result.get('output', '')}"
+            else:
+                final_status = "failed"
+                final_notes = f"{admin_notes}\n\nProvisioning failed:\n{result.get('error', '')}"
+
+            # Final state in a single UPDATE, without reloading the row
+            db.execute(
+                update(ResourceRequest)
+                .where(ResourceRequest.id == request_id)
+                .values(status=final_status, admin_notes=final_notes)
+            )
+            db.commit()
+
+            logger.info(f"Provisioning complete for request {request_id}: {final_status}")
+            return {"status": final_status, "request_id": request_id}
+
+        except Exception as e:
+            logger.error(f"Error provisioning request {request_id}: {str(e)}")
+
+            # Record the failure with one UPDATE built from the notes read
+            # earlier; touching the rolled-back (expired) row would reload it
+            db.rollback()
+            if admin_notes is not None:
+                try:
+                    db.execute(
+                        update(ResourceRequest)
+                        .where(ResourceRequest.id == request_id)
+                        .values(status="failed", admin_notes=f"{admin_notes}\n\nProvisioning error: {str(e)}")
+                    )
+                    db.commit()
+                except Exception:
+                    db.rollback()
+
+            # Out of time: retrying would only run into the limit again
+            if isinstance(e, SoftTimeLimitExceeded):
+                return {"status": "failed", "request_id": request_id}
+
+            raise self.retry(exc=e, countdown=60)
+
+
+@celery_app.task(ignore_result=True)
+def prewarm_workspace(resource_type: str):
+    """
+    Initialize the shared directory of a resource type once, ahead of a
+    batch of provision_resource tasks, so they find providers installed
+    instead of queueing on the init lock. Never raises: a failed prewarm
+    must not stop the batch chained after it, whose tasks init on their own.
+    """
+    if resource_type not in _SHARED_CONFIGS:
+        return
 
-    finally:
-        db.close()
+    try:
+        workspace_dir = os.path.join(TERRAFORM_WORKSPACES_PATH, resource_type)
+        os.makedirs(workspace_dir, exist_ok=True)
+        _write_shared_config(workspace_dir, resource_type)
+
+        result = _init_shared_dir(workspace_dir)
+        if not result["success"]:
+            logger.error(f"Prewarming {resource_type} failed: {result['error']}")
+    except Exception as e:
+        logger.error(f"Error prewarming {resource_type}: {str(e)}")
 
 
 def _provision_by_type(request: ResourceRequest) -> dict:
@@ -81,30 +170,64 @@ def _provision_by_type(request: ResourceRequest) -> dict:
 
     logger.info(f"Provisioning {resource_type}: {name} with config: {config}")
 
-    if resource_type == "database":
-        return _provision_database(request)
-    elif resource_type == "s3":
-        return _provision_s3(request)
-    elif resource_type == "k8s_namespace":
-        return _provision_k8s_namespace(request)
-    else:
+    provisioner = _PROVISIONERS.get(resource_type)
+    if provisioner is None:
         return {"success": False, "error": f"Unknown resource type: {resource_type}"}
+    return provisioner(request)
 
 
 def _generate_password(length=16):
-    alphabet = string.ascii_letters + string.digits
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
+    # One CSPRNG draw; URL-safe base64 ("-" and "_" are valid in RDS passwords)
+    return secrets.token_urlsafe(length)[:length]
+
+
+def _create_workspace(request_id: int, resource_type: str) -> tuple:
+    """
+    Return the shared working directory for a resource type and the
+    Terraform workspace name that isolates this request's state.
+
+    main.tf and provider.tf are shared by every request of the type, so
+    `.terraform` and its providers are reused between runs; per-request
+    variables and plans live under vars/ and plans/.
+    """
+    shared_dir = os.path.join(TERRAFORM_WORKSPACES_PATH, resource_type)
+    os.makedirs(os.path.join(shared_dir, "vars"), exist_ok=True)
+    os.makedirs(os.path.join(shared_dir, "plans"), exist_ok=True)
+    return shared_dir, f"request-{request_id}"
+
+
+def _var_file(workspace: str) -> str:
+    return os.path.join("vars", f"{workspace}.tfvars")
 
 
-def _create_workspace(request_id: int, resource_type: str) -> str:
-    workspace_dir = os.path.join(TERRAFORM_WORKSPACES_PATH, f"request-{request_id}")
-    os.makedirs(workspace_dir, exist_ok=True)
-    return workspace_dir
+def _plan_file(workspace: str) -> str:
+    return os.path.join("plans", f"{workspace}.tfplan")
 
 
-def _write_provider_config(workspace_dir: str, provider: str):
-    if provider == "aws":
-        provider_tf = '''
+def _write_shared_file(shared_dir: str, filename: str, content: str):
+    path = os.path.join(shared_dir, filename)
+
+    # Shared files are almost always already current; don't rewrite them
+    try:
+        with open(path) as f:
+            if f.read() == content:
+                return
+    except FileNotFoundError:
+        pass
+
+    # Other requests may be running Terraform in this directory: replace the
+    # file atomically so they never read a half-written configuration
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+# Terraform configuration is rendered from these templates, built once at
+# import. provider.tf and main.tf are identical for every request of a type;
+# only the tfvars differ per request.
+_PROVIDER_CONFIGS = {
+    "aws": '''
 terraform {
   required_providers {
     aws = {
@@ -122,9 +245,8 @@ variable "aws_region" {
   type    = string
   default = "us-east-1"
 }
-'''
-    elif provider == "kubernetes":
-        provider_tf = '''
+''',
+    "kubernetes": '''
 terraform {
   required_providers {
     kubernetes = {
@@ -142,37 +264,10 @@ variable "kubeconfig_path" {
   type    = string
   default = "~/.kube/config"
 }
-'''
-    else:
-        provider_tf = ""
-
-    with open(os.path.join(workspace_dir, "provider.tf"), "w") as f:
-        f.write(provider_tf)
-
-
-def _provision_database(request: ResourceRequest) -> dict:
-    config = request.config or {}
-    workspace_dir = _create_workspace(request.id, "database")
-
-    _write_provider_config(workspace_dir, "aws")
-
-    engine = config.get("engine", "postgres")
-    size = config.get("size", "small")
-
-    size_mapping = {
-        "small": "db.t3.micro",
-        "medium": "db.t3.small",
-        "large": "db.t3.medium",
-        "xlarge": "db.t3.large"
-    }
-
-    engine_versions = {
-        "postgres": "15.4",
-        "mysql": "8.0",
-        "mariadb": "10.6"
-    }
+''',
+}
 
-    main_tf = f'''
+_DATABASE_MAIN_TF = f'''
 module "database" {{
   source = "{TERRAFORM_MODULES_PATH}/database"
 
@@ -200,35 +295,20 @@ output "port" {{
 }}
 '''
 
-    tfvars = f'''
-name           = "{request.name}"
+_DATABASE_TFVARS = '''
+name           = "{name}"
 engine         = "{engine}"
-engine_version = "{engine_versions.get(engine, '15.4')}"
-instance_class = "{size_mapping.get(size, 'db.t3.micro')}"
-db_name        = "{config.get('db_name', 'appdb')}"
-username       = "{config.get('username', 'admin')}"
-password       = "{config.get('password', _generate_password())}"
-request_id     = "{request.id}"
-team_id        = "{request.team_id}"
-aws_region     = "{config.get('region', 'us-east-1')}"
+engine_version = "{engine_version}"
+instance_class = "{instance_class}"
+db_name        = "{db_name}"
+username       = "{username}"
+password       = "{password}"
+request_id     = "{request_id}"
+team_id        = "{team_id}"
+aws_region     = "{aws_region}"
 '''
 
-    with open(os.path.join(workspace_dir, "main.tf"), "w") as f:
-        f.write(main_tf)
-
-    with open(os.path.join(workspace_dir, "terraform.tfvars"), "w") as f:
-        f.write(tfvars)
-
-    return _run_terraform_workflow(workspace_dir)
-
-
-def _provision_s3(request: ResourceRequest) -> dict:
-    config = request.config or {}
-    workspace_dir = _create_workspace(request.id, "s3")
-
-    _write_provider_config(workspace_dir, "aws")
-
-    main_tf = f'''
+_S3_MAIN_TF = f'''
 module "s3" {{
   source = "{TERRAFORM_MODULES_PATH}/s3"
 
@@ -251,40 +331,15 @@ output "bucket_domain_name" {{
 }}
 '''
 
-    tfvars = f'''
-name       = "{request.name}"
-public     = {str(config.get('public', False)).lower()}
-request_id = "{request.id}"
-team_id    = "{request.team_id}"
-aws_region = "{config.get('region', 'us-east-1')}"
+_S3_TFVARS = '''
+name       = "{name}"
+public     = {public}
+request_id = "{request_id}"
+team_id    = "{team_id}"
+aws_region = "{aws_region}"
 '''
 
-    with open(os.path.join(workspace_dir, "main.tf"), "w") as f:
-        f.write(main_tf)
-
-    with open(os.path.join(workspace_dir, "terraform.tfvars"), "w") as f:
-        f.write(tfvars)
-
-    return _run_terraform_workflow(workspace_dir)
-
-
-def _provision_k8s_namespace(request: ResourceRequest) -> dict:
-    config = request.config or {}
-    workspace_dir = _create_workspace(request.id, "k8s_namespace")
-
-    _write_provider_config(workspace_dir, "kubernetes")
-
-    quota = config.get("quota", "standard")
-
-    quota_mapping = {
-        "small": {"cpu": "1", "memory": "2Gi", "pods": "10"},
-        "standard": {"cpu": "2", "memory": "4Gi", "pods": "20"},
-        "large": {"cpu": "4", "memory": "8Gi", "pods": "50"}
-    }
-
-    quota_config = quota_mapping.get(quota, quota_mapping["standard"])
-
-    main_tf = f'''
+_K8S_NAMESPACE_MAIN_TF = f'''
 module "k8s_namespace" {{
   source = "{TERRAFORM_MODULES_PATH}/k8s_namespace"
 
@@ -302,52 +357,158 @@ output "namespace_name" {{
 }}
 '''
 
-    tfvars = f'''
-name                  = "{request.name}"
+_K8S_NAMESPACE_TFVARS = '''
+name                  = "{name}"
 quota_enabled         = true
-quota_cpu_requests    = "{quota_config['cpu']}"
-quota_memory_requests = "{quota_config['memory']}"
-quota_pods            = "{quota_config['pods']}"
-request_id            = "{request.id}"
-team_id               = "{request.team_id}"
-kubeconfig_path       = "{config.get('kubeconfig', '~/.kube/config')}"
+quota_cpu_requests    = "{cpu}"
+quota_memory_requests = "{memory}"
+quota_pods            = "{pods}"
+request_id            = "{request_id}"
+team_id               = "{team_id}"
+kubeconfig_path       = "{kubeconfig_path}"
 '''
 
-    with open(os.path.join(workspace_dir, "main.tf"), "w") as f:
-        f.write(main_tf)
+_DATABASE_SIZES = {
+    "small": "db.t3.micro",
+    "medium": "db.t3.small",
+    "large": "db.t3.medium",
+    "xlarge": "db.t3.large"
+}
+
+_DATABASE_ENGINE_VERSIONS = {
+    "postgres": "15.4",
+    "mysql": "8.0",
+    "mariadb": "10.6"
+}
+
+_K8S_QUOTAS = {
+    "small": {"cpu": "1", "memory": "2Gi", "pods": "10"},
+    "standard": {"cpu": "2", "memory": "4Gi", "pods": "20"},
+    "large": {"cpu": "4", "memory": "8Gi", "pods": "50"}
+}
+
+
+# Provider and main.tf shared by every request of a resource type
+_SHARED_CONFIGS = {
+    "database": ("aws", _DATABASE_MAIN_TF),
+    "s3": ("aws", _S3_MAIN_TF),
+    "k8s_namespace": ("kubernetes", _K8S_NAMESPACE_MAIN_TF),
+}
+
 
-    with open(os.path.join(workspace_dir, "terraform.tfvars"), "w") as f:
+def _write_shared_config(workspace_dir: str, resource_type: str):
+    provider, main_tf = _SHARED_CONFIGS[resource_type]
+    _write_shared_file(workspace_dir, "provider.tf", _PROVIDER_CONFIGS.get(provider, ""))
+    _write_shared_file(workspace_dir, "main.tf", main_tf)
+
+
+def _write_request_config(workspace_dir: str, workspace: str, tfvars: str):
+    with open(os.path.join(workspace_dir, _var_file(workspace)), "w") as f:
         f.write(tfvars)
 
-    return _run_terraform_workflow(workspace_dir)
 
+def _provision_database(request: ResourceRequest) -> dict:
+    config = request.config or {}
+    workspace_dir, workspace = _create_workspace(request.id, "database")
 
-def _run_terraform_workflow(workspace_dir: str) -> dict:
-    logger.info(f"Running Terraform in {workspace_dir} (DRY_RUN={DRY_RUN_MODE})")
+    _write_shared_config(workspace_dir, "database")
 
-    init_result = _run_terraform(workspace_dir, ["init", "-no-color"])
-    if not init_result["success"]:
-        return {"success": False, "error": f"Terraform init failed:\n{init_result['error']}"}
+    engine = config.get("engine", "postgres")
+    size = config.get("size", "small")
 
-    plan_result = _run_terraform(workspace_dir, ["plan", "-no-color", "-out=tfplan"])
-    if not plan_result["success"]:
-        return {"success": False, "error": f"Terraform plan failed:\n{plan_result['error']}"}
+    tfvars = _DATABASE_TFVARS.format(
+        name=request.name,
+        engine=engine,
+        engine_version=_DATABASE_ENGINE_VERSIONS.get(engine, "15.4"),
+        instance_class=_DATABASE_SIZES.get(size, "db.t3.micro"),
+        db_name=config.get("db_name", "appdb"),
+        username=config.get("username", "admin"),
+        password=config.get("password", _generate_password()),
+        request_id=request.id,
+        team_id=request.team_id,
+        aws_region=config.get("region", "us-east-1"),
+    )
+
+    _write_request_config(workspace_dir, workspace, tfvars)
+
+    return _run_terraform_workflow(workspace_dir, workspace)
+
+
+def _provision_s3(request: ResourceRequest) -> dict:
+    config = request.config or {}
+    workspace_dir, workspace = _create_workspace(request.id, "s3")
+
+    _write_shared_config(workspace_dir, "s3")
+
+    tfvars = _S3_TFVARS.format(
+        name=request.name,
+        public=str(config.get("public", False)).lower(),
+        request_id=request.id,
+        team_id=request.team_id,
+        aws_region=config.get("region", "us-east-1"),
+    )
+
+    _write_request_config(workspace_dir, workspace, tfvars)
 
-    if DRY_RUN_MODE:
-        logger.info("DRY RUN MODE: Skipping terraform apply")
-        return {
-            "success": True,
-            "output": f"[DRY RUN] Plan completed successfully.\nWorkspace: {workspace_dir}\n\nPlan output:\n{plan_result['output'][:2000]}"
-        }
+    return _run_terraform_workflow(workspace_dir, workspace)
+
+
+def _provision_k8s_namespace(request: ResourceRequest) -> dict:
+    config = request.config or {}
+    workspace_dir, workspace = _create_workspace(request.id, "k8s_namespace")
+
+    _write_shared_config(workspace_dir, "k8s_namespace")
+
+    quota = config.get("quota", "standard")
+    quota_config = _K8S_QUOTAS.get(quota, _K8S_QUOTAS["standard"])
+
+    tfvars = _K8S_NAMESPACE_TFVARS.format(
+        name=request.name,
+        request_id=request.id,
+        team_id=request.team_id,
+        kubeconfig_path=config.get("kubeconfig", "~/.kube/config"),
+        **quota_config
+    )
+
+    _write_request_config(workspace_dir, workspace, tfvars)
+
+    return _run_terraform_workflow(workspace_dir, workspace)
+
+
+# Provisioner for each supported resource_type
+_PROVISIONERS = {
+    "database": _provision_database,
+    "s3": _provision_s3,
+    "k8s_namespace": _provision_k8s_namespace,
+}
+
+
+def _run_terraform_workflow(workspace_dir: str, workspace: str) -> dict:
+    logger.info(f"Running Terraform in {workspace_dir}, workspace {workspace} (DRY_RUN={DRY_RUN_MODE})")
+
+    init_result = _init_shared_dir(workspace_dir, workspace)
+    if not init_result["success"]:
+        return init_result
+
+    with _shared_dir_lock(workspace_dir, fcntl.LOCK_SH):
+        if DRY_RUN_MODE:
+            return _run_terraform_plan(workspace_dir, workspace)
+
+        # Apply plans and applies in one process; a separate saved plan would
+        # only add a Terraform start-up and provider handshake
+        apply_result = _run_terraform(
+            workspace_dir,
+            ["apply", "-no-color", "-input=false", "-auto-approve", f"-var-file={_var_file(workspace)}"],
+            workspace=workspace
+        )
+        if not apply_result["success"]:
+            return {"success": False, "error": f"Terraform apply failed:\n{apply_result['error']}"}
 
-    apply_result = _run_terraform(workspace_dir, ["apply", "-no-color", "-auto-approve", "tfplan"])
-    if not apply_result["success"]:
-        return {"success": False, "error": f"Terraform apply failed:\n{apply_result['error']}"}
+        output_result = _run_terraform(workspace_dir, ["output", "-json"], keep_full_output=True, workspace=workspace)
 
-    output_result = _run_terraform(workspace_dir, ["output", "-json"])
     if output_result["success"]:
         try:
-            outputs = json.loads(output_result["output"])
+            outputs = orjson.loads(output_result["output"])
             output_str = "\n".join([f"{k}: {v.get('value', 'N/A')}" for k, v in outputs.items()])
             return {"success": True, "output": output_str}
         except:
@@ -356,28 +517,174 @@ def _run_terraform_workflow(workspace_dir: str) -> dict:
     return {"success": True, "output": apply_result["output"]}
 
 
-def _run_terraform(workspace_dir: str, command: list) -> dict:
+@contextmanager
+def _shared_dir_lock(workspace_dir: str, operation: int):
+    """
+    Hold a shared directory's .init.lock: LOCK_EX while changing .terraform
+    (init, workspace new, cleanup), LOCK_SH while running commands that use
+    it (plan, apply, output, destroy), so init never swaps providers under a
+    running command.
+    """
+    with open(os.path.join(workspace_dir, ".init.lock"), "w") as lock_file:
+        fcntl.flock(lock_file, operation)
+        yield
+
+
+def _init_shared_dir(workspace_dir: str, workspace: str = None) -> dict:
+    """
+    Run `terraform init` in a shared directory if its configuration changed,
+    and create the request's workspace when one is given. Both touch the
+    shared .terraform directory, so they are serialized across workers.
+    """
+    with _shared_dir_lock(workspace_dir, fcntl.LOCK_EX):
+        if _needs_init(workspace_dir):
+            # `workspace new` leaves the last request's workspace selected in
+            # .terraform/environment, and cleanup_workspace may have removed
+            # it since; init against the default workspace, which always exists
+            init_result = _run_terraform(
+                workspace_dir, ["init", "-no-color", "-input=false"], workspace=DEFAULT_WORKSPACE
+            )
+            if not init_result["success"]:
+                return {"success": False, "error": f"Terraform init failed:\n{init_result['error']}"}
+            _record_init(workspace_dir)
+        else:
+            logger.info(f"Skipping terraform init in {workspace_dir}: configuration unchanged")
+
+        # Retries find the workspace already created; skip the extra process
+        if workspace and not os.path.isdir(os.path.join(workspace_dir, "terraform.tfstate.d", workspace)):
+            workspace_result = _run_terraform(workspace_dir, ["workspace", "new", "-no-color", workspace])
+            if not workspace_result["success"] and "already exists" not in workspace_result["error"]:
+                return {"success": False, "error": f"Terraform workspace creation failed:\n{workspace_result['error']}"}
+
+    return {"success": True}
+
+
+def _run_terraform_plan(workspace_dir: str, workspace: str) -> dict:
+    plan_result = _run_terraform(
+        workspace_dir,
+        ["plan", "-no-color", "-input=false", f"-var-file={_var_file(workspace)}", f"-out={_plan_file(workspace)}"],
+        workspace=workspace
+    )
+    if not plan_result["success"]:
+        return {"success": False, "error": f"Terraform plan failed:\n{plan_result['error']}"}
+
+    logger.info("DRY RUN MODE: Skipping terraform apply")
+    return {
+        "success": True,
+        "output": f"[DRY RUN] Plan completed successfully.\nWorkspace: {workspace_dir} ({workspace})\n\nPlan output:\n{plan_result['output'][:2000]}"
+    }
+
+
+def _config_hash(workspace_dir: str) -> str:
+    digest = hashlib.sha256()
+    for filename in ("provider.tf", "main.tf"):
+        with open(os.path.join(workspace_dir, filename), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _needs_init(workspace_dir: str) -> bool:
+    """
+    Whether `terraform init` has to run: providers are missing, or the
+    provider/module configuration changed since the last successful init.
+    """
+    if not os.path.isdir(os.path.join(workspace_dir, ".terraform", "providers")):
+        return True
+    try:
+        with open(os.path.join(workspace_dir, ".terraform", ".init_hash")) as f:
+            return f.read() != _config_hash(workspace_dir)
+    except FileNotFoundError:
+        return True
+
+
+def _record_init(workspace_dir: str):
+    with open(os.path.join(workspace_dir, ".terraform", ".init_hash"), "w") as f:
+        f.write(_config_hash(workspace_dir))
+
+
+def _run_terraform(
+    workspace_dir: str,
+    command: list,
+    keep_full_output: bool = False,
+    workspace: str = None
+) -> dict:
+    """
+    Run a Terraform command, streaming its output to the log line by line.
+    Only the last TERRAFORM_OUTPUT_TAIL_LINES lines are kept in memory.
+    With keep_full_output the whole output is kept and not logged, for
+    machine-readable commands such as `output -json`. workspace selects
+    the Terraform workspace through TF_WORKSPACE, so concurrent runs in a
+    shared directory don't depend on its selected workspace.
+    """
     try:
         logger.info(f"Running: terraform {' '.join(command)}")
 
-        result = subprocess.run(
+        process = subprocess.Popen(
             ["terraform"] + command,
             cwd=workspace_dir,
-            capture_output=True,
-            text=True,
-            timeout=600
+            env={**_TERRAFORM_ENV, "TF_WORKSPACE": workspace} if workspace else _TERRAFORM_ENV,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            start_new_session=True
         )
 
-        if result.returncode == 0:
+        # Kill the process group if it runs too long; reading stdout blocks
+        # until every process holding the pipe has exited
+        timed_out = threading.Event()
+
+        def _kill_group() -> bool:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+                return True
+            except ProcessLookupError:
+                # Already exited and reaped
+                return False
+
+        def _kill():
+            if _kill_group():
+                timed_out.set()
+
+        timer = threading.Timer(TERRAFORM_TIMEOUT_SECONDS, _kill)
+        timer.start()
+
+        # Tag streamed lines with the workspace: several runs share a
+        # directory and interleave in the worker log
+        log_prefix = workspace if workspace not in (None, DEFAULT_WORKSPACE) else os.path.basename(workspace_dir)
+        log_lines = not keep_full_output and logger.isEnabledFor(logging.INFO)
+
+        # Lines stay bytes; only logged lines and the kept tail are decoded
+        output = deque(maxlen=None if keep_full_output else TERRAFORM_OUTPUT_TAIL_LINES)
+        try:
+            for line in process.stdout:
+                if log_lines:
+                    logger.info("[%s] %s", log_prefix, line.decode("utf-8", errors="replace").rstrip())
+                output.append(line)
+            returncode = process.wait()
+        finally:
+            timer.cancel()
+            # Reading was interrupted; don't leave the process running
+            # or unreaped
+            if process.poll() is None:
+                _kill_group()
+                process.wait()
+            process.stdout.close()
+
+        if timed_out.is_set():
+            logger.error("Terraform command timed out")
+            return {"success": False, "error": f"Terraform command timed out after {TERRAFORM_TIMEOUT_SECONDS} seconds"}
+
+        text = b"".join(output).decode("utf-8", errors="replace")
+        if returncode == 0:
             logger.info(f"Terraform command succeeded")
-            return {"success": True, "output": result.stdout}
+            return {"success": True, "output": text}
         else:
-            logger.error(f"Terraform command failed: {result.stderr}")
-            return {"success": False, "error": result.stderr or result.stdout}
+            logger.error(f"Terraform command failed with exit code {returncode}")
+            return {"success": False, "error": text}
 
-    except subprocess.TimeoutExpired:
-        logger.error("Terraform command timed out")
-        return {"success": False, "error": "Terraform command timed out after 10 minutes"}
+    except SoftTimeLimitExceeded:
+        # The task's time is up; the process was killed above, let the task
+        # record the failure
+        raise
     except FileNotFoundError:
         logger.error("Terraform not found")
         return {"success": False, "error": "Terraform CLI not found. Please install Terraform."}
@@ -386,38 +693,83 @@ def _run_terraform(workspace_dir: str, command: list) -> dict:
         return {"success": False, "error": str(e)}
 
 
-@celery_app.task(bind=True)
+@celery_app.task(bind=True, time_limit=DESTROY_TIME_LIMIT)
 def destroy_resource(self, request_id: int):
-    db = SessionLocal()
-
     try:
-        request = db.query(ResourceRequest).filter(ResourceRequest.id == request_id).first()
-
-        if not request:
-            return {"status": "error", "message": "Request not found"}
-
-        workspace_dir = os.path.join(TERRAFORM_WORKSPACES_PATH, f"request-{request_id}")
-
-        if not os.path.exists(workspace_dir):
-            return {"status": "error", "message": "Workspace not found"}
-
-        logger.info(f"Destroying resources for request {request_id}")
-
-        destroy_result = _run_terraform(workspace_dir, ["destroy", "-no-color", "-auto-approve"])
-
-        if destroy_result["success"]:
-            request.status = "destroyed"
-            request.admin_notes = f"{request.admin_notes or ''}\n\nResources destroyed successfully"
-            shutil.rmtree(workspace_dir, ignore_errors=True)
-        else:
-            request.admin_notes = f"{request.admin_notes or ''}\n\nDestroy failed:\n{destroy_result['error']}"
-
-        db.commit()
-        return {"status": request.status, "request_id": request_id}
+        with task_session() as db:
+            request = db.get(ResourceRequest, request_id)
+
+            if not request:
+                return {"status": "error", "message": "Request not found"}
+
+            workspace_dir = os.path.join(TERRAFORM_WORKSPACES_PATH, request.resource_type)
+            workspace = f"request-{request_id}"
+            state_dir = os.path.join(workspace_dir, "terraform.tfstate.d", workspace)
+
+            # Requests provisioned before resource types shared a directory
+            # have their own, with terraform.tfvars and the default workspace
+            legacy_dir = os.path.join(TERRAFORM_WORKSPACES_PATH, workspace)
+            is_legacy = not os.path.exists(state_dir) and os.path.isdir(legacy_dir)
+
+            if not os.path.exists(state_dir) and not is_legacy:
+                return {"status": "error", "message": "Workspace not found"}
+
+            logger.info(f"Destroying resources for request {request_id}")
+
+            if is_legacy:
+                destroy_result = _run_terraform(
+                    legacy_dir, ["destroy", "-no-color", "-input=false", "-auto-approve"]
+                )
+            else:
+                with _shared_dir_lock(workspace_dir, fcntl.LOCK_SH):
+                    destroy_result = _run_terraform(
+                        workspace_dir,
+                        ["destroy", "-no-color", "-input=false", "-auto-approve", f"-var-file={_var_file(workspace)}"],
+                        workspace=workspace
+                    )
+
+            if destroy_result["success"]:
+                request.status = "destroyed"
+                request.admin_notes = f"{request.admin_notes or ''}\n\nResources destroyed successfully"
+            else:
+                request.admin_notes = f"{request.admin_notes or ''}\n\nDestroy failed:\n{destroy_result['error']}"
+
+            db.commit()
+
+            # File cleanup doesn't hold up the destroyed status
+            if destroy_result["success"]:
+                if is_legacy:
+                    shutil.rmtree(legacy_dir, ignore_errors=True)
+                else:
+                    cleanup_workspace.delay(workspace_dir, workspace)
+
+            return {"status": request.status, "request_id": request_id}
 
     except Exception as e:
         logger.error(f"Error destroying request {request_id}: {str(e)}")
         return {"status": "error", "message": str(e)}
 
-    finally:
-        db.close()
\ No newline at end of file
+
+@celery_app.task(ignore_result=True)
+def cleanup_workspace(workspace_dir: str, workspace: str):
+    """
+    Remove a destroyed request's state, variables and plan. The shared
+    directory stays initialized for other requests.
+    """
+    # Never leave the shared directory with the removed workspace selected
+    with _shared_dir_lock(workspace_dir, fcntl.LOCK_EX):
+        environment_file = os.path.join(workspace_dir, ".terraform", "environment")
+        try:
+            with open(environment_file) as f:
+                selected = f.read().strip()
+            if selected == workspace:
+                os.remove(environment_file)
+        except FileNotFoundError:
+            pass
+
+    shutil.rmtree(os.path.join(workspace_dir, "terraform.tfstate.d", workspace), ignore_errors=True)
+    for path in (_var_file(workspace), _plan_file(workspace)):
+        try:
+            os.remove(os.path.join(workspace_dir, path))
+        except FileNotFoundError:
+            pass
@@ -4,7 +4,6 @@ System health check script.
 Verifies database, users, and configuration.
 """
 import os
-import sys
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -20,7 +19,6 @@ def check_environment():
 
 def check_database():
     print("Checking database...")
-    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
     from database import SessionLocal, engine
     from models import User, Team
@@ -56,19 +54,12 @@ def check_ports():
     print("Checking if ports are available...")
     import socket
 
-    def is_port_in_use(port):
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            return s.connect_ex(('localhost', port)) == 0
-
-    if is_port_in_use(8000):
-        print("  ✓ Port 8000 is IN USE (backend should be running)")
-    else:
-        print("  ✗ Port 8000 is FREE (backend NOT running)")
-
-    if is_port_in_use(3000):
-        print("  ✓ Port 3000 is IN USE (frontend should be running)")
-    else:
-        print("  ✗ Port 3000 is FREE (frontend NOT running)")
+    for port, service in ((8000, "backend"), (3000, "frontend")):
+        try:
+            socket.create_connection(("localhost", port), timeout=0.1).close()
+            print(f"  ✓ Port {port} is IN USE ({service} should be running)")
+        except OSError:
+            print(f"  ✗ Port {port} is FREE ({service} NOT running)")
     print()
 
 def main():
@@ -3,88 +3,86 @@
 Script to create test users with known passwords.
 Usage: python create_test_user.py
 """
-import os
-import sys
+from datetime import datetime
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from sqlalchemy import exists, select
 
-from database import SessionLocal
+from database import SessionLocal, upsert
 from models import User, Team
-from auth.auth import hash_password
+from auth.auth import pwd_context
 
-def create_or_reset_user(username: str, email: str, password: str, is_admin: bool = False, team_id: int = None):
-    """Create a new user or reset password if user exists."""
-    db = SessionLocal()
-    try:
-        # Check if user exists
-        user = db.query(User).filter(User.username == username).first()
+# Test accounts only: a single argon2 pass over 1 MiB hashes in about a
+# millisecond instead of tens. Real users keep the default cost, and a test
+# user's hash is upgraded to it on first login.
+test_pwd_context = pwd_context.copy(argon2__time_cost=1, argon2__memory_cost=1024)
 
-        if user:
-            print(f"User '{username}' already exists. Resetting password...")
-            user.password_hash = hash_password(password)
-            user.email = email
-            user.is_admin = is_admin
-            user.team_id = team_id
-            db.commit()
-            print(f"✓ Password reset for user: {username}")
-        else:
-            print(f"Creating new user: {username}")
-            new_user = User(
-                username=username,
-                email=email,
-                password_hash=hash_password(password),
-                is_admin=is_admin,
-                team_id=team_id
-            )
-            db.add(new_user)
-            db.commit()
-            print(f"✓ Created user: {username}")
+TEST_USERS = [
+    {"username": "admin", "email": "admin@example.com", "password": "admin123", "is_admin": True},
+    {"username": "testuser", "email": "test@example.com", "password": "test123", "is_admin": False},
+]
 
-        print(f"  Email: {email}")
-        print(f"  Password: {password}")
-        print(f"  Admin: {is_admin}")
-        print(f"  Team ID: {team_id}")
-        print()
 
+def create_or_reset_users(users: list, team_id: int = None):
+    """Create the users, or reset them if they exist, with a single upsert."""
+    rows = [
+        {
+            "username": user["username"],
+            "email": user["email"],
+            "password_hash": test_pwd_context.hash(user["password"]),
+            "is_admin": user["is_admin"],
+            # Admins stay outside teams
+            "team_id": None if user["is_admin"] else team_id,
+        }
+        for user in users
+    ]
+
+    stmt = upsert(User).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.username],
+        set_={
+            "email": stmt.excluded.email,
+            "password_hash": stmt.excluded.password_hash,
+            "is_admin": stmt.excluded.is_admin,
+            "team_id": stmt.excluded.team_id,
+            "updated_at": datetime.utcnow(),
+        }
+    )
+
+    db = SessionLocal()
+    try:
+        db.execute(stmt)
+        db.commit()
     except Exception as e:
         print(f"✗ Error: {str(e)}")
         db.rollback()
+        return
     finally:
         db.close()
 
+    for row, user in zip(rows, users):
+        print(f"✓ Created or reset user: {row['username']}")
+        print(f"  Email: {row['email']}")
+        print(f"  Password: {user['password']}")
+        print(f"  Admin: {row['is_admin']}")
+        print(f"  Team ID: {row['team_id']}")
+        print()
+
 def main():
     print("=" * 60)
     print("InfraUtomater - Test User Creation")
     print("=" * 60)
     print()
 
-    # Create/reset admin user
-    create_or_reset_user(
-        username="admin",
-        email="admin@example.com",
-        password="admin123",
-        is_admin=True,
-        team_id=None
-    )
-
     # Check if Team 1 exists
     db = SessionLocal()
-    team = db.query(Team).filter(Team.id == 1).first()
+    team_exists = db.scalar(select(exists().where(Team.id == 1)))
     db.close()
 
-    # Create/reset regular user
-    create_or_reset_user(
-        username="testuser",
-        email="test@example.com",
-        password="test123",
-        is_admin=False,
-        team_id=1 if team else None
-    )
+    create_or_reset_users(TEST_USERS, team_id=1 if team_exists else None)
 
     print("=" * 60)
     print("Test users ready! You can now log in with:")
@@ -127,7 +127,7 @@ const Admin = () => {
         setError('Please select both a team and a user');
         return;
       }
-      await adminService.addTeamMember(selectedTeam, selectedUser);
+      await adminService.addTeamMembers(selectedTeam, [Number(selectedUser)]);
       setSuccess('User added to team successfully!');
       setShowModal(false);
       setSelectedTeam('');
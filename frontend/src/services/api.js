@@ -2,6 +2,9 @@ import axios from 'axios';
 
 const API_BASE = 'http://localhost:8000/api/v1';
 
+// Largest page the admin list endpoints will return
+const MAX_PAGE_SIZE = 200;
+
 const api = axios.create({
   baseURL: API_BASE,
   headers: {
@@ -29,6 +32,22 @@ api.interceptors.response.use(
   }
 );
 
+// Fetch every item of a keyset-paginated list by following next_cursor
+async function getAllPages(url, params = {}) {
+  const items = [];
+  let cursor = null;
+  do {
+    const pageParams = { ...params, limit: MAX_PAGE_SIZE };
+    if (cursor !== null) {
+      pageParams.cursor = cursor;
+    }
+    const response = await api.get(url, { params: pageParams });
+    items.push(...response.data.items);
+    cursor = response.data.next_cursor;
+  } while (cursor !== null && cursor !== undefined);
+  return items;
+}
+
 export const authService = {
   async login(username, password) {
     const formData = new URLSearchParams();
@@ -82,12 +101,11 @@ export const userService = {
 
 export const adminService = {
   async getAllRequests(statusFilter = null) {
-    let url = '/admin/requests';
+    const params = {};
     if (statusFilter) {
-      url += `?status_filter=${statusFilter}`;
+      params.status_filter = statusFilter;
     }
-    const response = await api.get(url);
-    return response.data;
+    return getAllPages('/admin/requests', params);
   },
 
   async getRequest(id) {
@@ -102,6 +120,14 @@ export const adminService = {
     return response.data;
   },
 
+  async approveRequests(ids, adminNotes = '') {
+    const response = await api.put('/admin/requests/approve', {
+      request_ids: ids,
+      admin_notes: adminNotes,
+    });
+    return response.data;
+  },
+
   async rejectRequest(id, adminNotes) {
     const response = await api.put(`/admin/requests/${id}/reject`, {
       admin_notes: adminNotes,
@@ -110,8 +136,7 @@ export const adminService = {
   },
 
   async getTeams() {
-    const response = await api.get('/admin/teams');
-    return response.data;
+    return getAllPages('/admin/teams');
   },
 
   async createTeam(name, description) {
@@ -119,21 +144,19 @@ export const adminService = {
     return response.data;
   },
 
-  async addTeamMember(teamId, userId) {
+  async addTeamMembers(teamId, userIds) {
     const response = await api.post(`/admin/teams/${teamId}/members`, {
-      user_id: userId,
+      user_ids: userIds,
     });
     return response.data;
   },
 
   async getUsers() {
-    const response = await api.get('/admin/users');
-    return response.data;
+    return getAllPages('/admin/users');
   },
 
   async getAWSCredentials() {
-    const response = await api.get('/admin/aws-credentials');
-    return response.data;
+    return getAllPages('/admin/aws-credentials');
   },
 
   async createAWSCredentials(credentials) {
@@ -1,17 +1,21 @@
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import logging
-from database import Base, engine
+import os
+
+# Load environment variables from .env file before importing modules that
+# read configuration at import time (database URL, secrets)
+load_dotenv()
+
+from database import engine
 from admin_routes.teamanagement import admin
 from admin_routes.requests import admin_request_router
 from admin_routes.aws_credentials import aws_credentials_router
 from user_routes.users import user_router
 from user_routes.requests import request_router
 
-# Load environment variables from .env file
-load_dotenv()
-
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,9 +29,20 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 logger.info("Application starting...")
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
+# Route handlers are sync `def` functions backed by a sync SQLAlchemy session,
+# so FastAPI runs each one on an AnyIO worker thread. This caps how many
+# requests can be in flight at once.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "40"))
+
+# The schema is managed by Alembic (`alembic upgrade head`). Set
+# RUN_MIGRATIONS=1 on a single instance to apply migrations at startup.
+RUN_MIGRATIONS = os.getenv("RUN_MIGRATIONS", "0") == "1"
 
+# Keep the default JSONResponse: for routes with a response_model, FastAPI
+# has Pydantic serialize straight to JSON bytes in Rust, which beats
+# re-encoding the validated model with orjson. A custom default response
+# class would switch that path off for every route. Handlers that return
+# plain rows use the orjson responses in utils.responses instead.
 app = FastAPI(title="Infrastructure API")
 
 app.add_middleware(
@@ -49,7 +64,18 @@ app.include_router(request_router)
 
 @app.on_event("startup")
 async def startup_event():
+    if RUN_MIGRATIONS:
+        from alembic import command
+        from alembic.config import Config
+
+        alembic_config = Config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini"))
+        alembic_config.attributes["configure_logger"] = False  # keep our logging setup
+        command.upgrade(alembic_config, "head")
+        logger.info("Database migrations applied")
+
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
     logger.info("FastAPI application started successfully")
+    logger.info(f"Worker threads: {THREADPOOL_SIZE}")
     logger.info(f"Database: {engine.url}")
     logger.info("CORS enabled for: http://localhost:3000, http://127.0.0.1:3000")
 
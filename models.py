@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, ForeignKey,  JSON
+from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, ForeignKey, Index, JSON
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -13,13 +13,13 @@ class Team(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, nullable=False)
     description = Column(Text, nullable=True)
-    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_by = Column(Integer, ForeignKey("users.id", use_alter=True, name="fk_teams_created_by_users"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     creator = relationship("User", back_populates="created_teams", foreign_keys=[created_by])
-    members = relationship("User", back_populates="team", foreign_keys="User.team_id")
+    members = relationship("User", back_populates="team", foreign_keys="User.team_id", lazy="raise")
     resource_requests = relationship("ResourceRequest", back_populates="team")
 
 
@@ -33,7 +33,7 @@ class User(Base):
     username = Column(String, unique=True, index=True, nullable=False)
     password_hash = Column(String, nullable=False)
     is_admin = Column(Boolean, default=False, nullable=False)
-    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -49,7 +49,7 @@ class ResourceRequest(Base):
     id = Column(Integer, primary_key=True, index=True)
 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)
 
     resource_type = Column(String(50), nullable=False)
     # "database", "s3", "k8s_namespace"
@@ -71,6 +71,13 @@ class ResourceRequest(Base):
     user = relationship("User", back_populates="resource_requests")
     team = relationship("Team", back_populates="resource_requests")
 
+    __table_args__ = (
+        # Admin request list: filter by status, newest (highest id) first
+        Index("ix_req_status_id", "status", "id"),
+        # A user's own requests, in creation order
+        Index("ix_req_user_created", "user_id", "created_at"),
+    )
+
 
 class AWSCredentials(Base):
     """SQLAlchemy model for AWS credentials with encryption."""
@@ -95,4 +102,14 @@ class AWSCredentials(Base):
 
     # Relationships
     team = relationship("Team", foreign_keys=[team_id])
-    creator = relationship("User", foreign_keys=[created_by])
\ No newline at end of file
+    creator = relationship("User", foreign_keys=[created_by])
+
+    __table_args__ = (
+        # Partial index: only active credentials are listed
+        Index(
+            "ix_awscred_active",
+            "id",
+            sqlite_where=is_active == True,
+            postgresql_where=is_active == True,
+        ),
+    )
\ No newline at end of file
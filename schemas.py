@@ -1,6 +1,15 @@
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, EmailStr
+from typing import Generic, Optional, List, TypeVar
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+
+
+T = TypeVar("T")
+
+
+# ============ Pagination Schemas ============
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[int] = None
 
 
 # ============ Token Schemas ============
@@ -11,14 +20,13 @@ class Token(BaseModel):
 
 # ============ User Schemas ============
 class UserBase(BaseModel):
-    email: EmailStr
+    email: str
     username: str
 
 
 class UserCreate(UserBase):
+    email: EmailStr  # validated on input only; stored emails are trusted
     password: str
-    username: str
-    email: str
 
 
 class UserResponse(UserBase):
@@ -27,8 +35,7 @@ class UserResponse(UserBase):
     team_id: Optional[int] = None
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============ Team Schemas ============
@@ -52,20 +59,12 @@ class TeamResponse(TeamBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
-
-
-class TeamWithMembers(TeamResponse):
-    members: List[UserResponse] = []
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============ Member Schemas ============
 class AddMemberRequest(BaseModel):
-    user_id: int
-
-class TeamDetails(BaseModel):
-    id: str
+    user_ids: List[int] = Field(..., min_length=1)
 
 
 # ============ Resource Request Schemas ============
@@ -93,14 +92,18 @@ class ResourceRequestResponse(ResourceRequestBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ResourceRequestApproval(BaseModel):
     admin_notes: Optional[str] = None
 
 
+class ResourceRequestBulkApproval(BaseModel):
+    request_ids: List[int] = Field(..., min_length=1)
+    admin_notes: Optional[str] = None
+
+
 class ResourceRequestRejection(BaseModel):
     admin_notes: str  # Required when rejecting
 
@@ -122,8 +125,7 @@ class AWSCredentialsResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AWSCredentialsTestResult(BaseModel):
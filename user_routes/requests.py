@@ -1,26 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List
 
 from database import get_db
-from models import User, ResourceRequest
-from schemas import (
-    ResourceRequestCreate,
-    ResourceRequestResponse,
-    ResourceRequestUpdate
-)
+from models import ResourceRequest
+from schemas import ResourceRequestCreate, ResourceRequestResponse
 from auth.auth import get_current_user
+from utils.responses import STREAM_BATCH_SIZE, construct, stream_rows
 
 request_router = APIRouter(prefix="/api/v1/users", tags=["User Requests"])
 
+# Columns of ResourceRequestResponse, selected directly for list endpoints
+_REQUEST_COLUMNS = [getattr(ResourceRequest, field) for field in ResourceRequestResponse.model_fields]
 
-# TODO: Add your endpoints here
-# 1. POST /requests - Submit new resource request
-# 2. GET /requests - View my requests
-# 3. GET /requests/{id} - Get specific request details
-
-    
 
+# 1. POST /requests/submit - Submit new resource request
 @request_router.post("/requests/submit",response_model=ResourceRequestResponse)
 def submit_request(request:ResourceRequestCreate,db: Session = Depends(get_db),user = Depends(get_current_user)):
     if not user.team_id:
@@ -39,14 +34,24 @@ def submit_request(request:ResourceRequestCreate,db: Session = Depends(get_db),u
     return resource_request
 
 
-@request_router.get("/requests",response_model=ResourceRequestResponse)
-def view_my_request(db: Session = Depends(get_db),user = Depends(get_current_user)):
-    requests = db.query(ResourceRequest).filter(ResourceRequest.user_id == user.id).all()
-    return requests
+# 2. GET /requests - View my requests
+@request_router.get("/requests", response_model=List[ResourceRequestResponse])
+def view_my_requests(db: Session = Depends(get_db),user = Depends(get_current_user)):
+    # Plain rows straight to orjson, streamed in batches: no ORM objects,
+    # response validation or whole-list buffering
+    stmt = (
+        select(*_REQUEST_COLUMNS)
+        .where(ResourceRequest.user_id == user.id)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    return stream_rows(db.execute(stmt).mappings())
 
 
-@request_router.get("/requests/{id}",response_model=ResourceRequestResponse)
-def view_my_request(db: Session = Depends(get_db),user = Depends(get_current_user)):
-    requests = db.query(ResourceRequest).filter(ResourceRequest.user_id == user.id,
-    ResourceRequest.user_id == user.id ).all()
-    return requests
+# 3. GET /requests/{id} - Get specific request details
+@request_router.get("/requests/{request_id}", response_model=ResourceRequestResponse)
+def get_my_request(request_id: int, db: Session = Depends(get_db), user = Depends(get_current_user)):
+    # Primary-key lookup; someone else's request is reported as not found
+    request = db.get(ResourceRequest, request_id)
+    if not request or request.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Request not found")
+    return construct(ResourceRequestResponse, request)
@@ -1,16 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import timedelta
 import logging
 
 from database import get_db
-from models import User, Team
+from models import User
 from schemas import UserCreate, UserResponse, Token, TeamResponse
-from typing import List
+from typing import List, Optional
+from utils.responses import ORJSONResponse, construct, rows_response
 from auth.auth import (
     hash_password,
-    verify_password,
+    verify_and_update_password,
     create_access_token,
     get_current_user,
     ACCESS_TOKEN_EXPIRE_MINUTES
@@ -20,31 +23,57 @@ logger = logging.getLogger(__name__)
 
 user_router = APIRouter(prefix="/api/v1/auth", tags=["Auth"])
 
+# Unique indexes on users and the error reported when registration hits one
+_DUPLICATE_DETAILS = {
+    "ix_users_email": "Email already exists",
+    "ix_users_username": "Username already exists",
+}
+
+# SQLite names the violated column instead of the index
+_SQLITE_UNIQUE_COLUMNS = {
+    "users.email": "ix_users_email",
+    "users.username": "ix_users_username",
+}
+
+
+def _violated_unique_index(error: IntegrityError) -> Optional[str]:
+    """Name of the users unique index an INSERT violated, if that was the cause."""
+    diag = getattr(error.orig, "diag", None)
+    if diag is not None:
+        # PostgreSQL: 23505 is unique_violation
+        if getattr(error.orig, "pgcode", None) == "23505":
+            return diag.constraint_name
+        return None
+
+    prefix = "UNIQUE constraint failed: "
+    message = str(error.orig)
+    if message.startswith(prefix):
+        return _SQLITE_UNIQUE_COLUMNS.get(message[len(prefix):])
+    return None
+
 
 
                                                                                                                                                     
 @user_router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)                                                    
 def register(user_data: UserCreate, db: Session = Depends(get_db)):                                                                                                                                                                                                        
-      existing_email = db.query(User).filter(User.email == user_data.email).first()                                                                   
-      if existing_email:                                                                                                                              
-          raise HTTPException(status_code=400, detail="Email already exists")                                                                         
-                                                                                                                                                      
-                                                                                                                   
-      existing_username = db.query(User).filter(User.username == user_data.username).first()                                                          
-      if existing_username:                                                                                                                           
-          raise HTTPException(status_code=400, detail="Username already exists")                                                                      
-                                                                                                                                                      
-                                                                                                              
-      hashed_password = hash_password(user_data.password)                                                                                             
-      user = User(                                                                                                                                    
-          username=user_data.username,                                                                                                    
-          email=user_data.email,                                                                                                                      
-          password_hash=hashed_password                                                                                                               
-      )                                                                                                                                               
-                                                                                                                                                      
-      db.add(user)                                                                                                                                    
-      db.commit()                                                                                                                                     
-      db.refresh(user)                                                                                                                     
+      # Unique indexes on email and username reject duplicates in the INSERT
+      hashed_password = hash_password(user_data.password)
+      user = User(
+          username=user_data.username,
+          email=user_data.email,
+          password_hash=hashed_password
+      )
+
+      db.add(user)
+      try:
+          db.commit()
+      except IntegrityError as e:
+          db.rollback()
+          detail = _DUPLICATE_DETAILS.get(_violated_unique_index(e))
+          if detail is None:
+              raise
+          raise HTTPException(status_code=400, detail=detail)
+      db.refresh(user)
       return user  
 
 @user_router.post("/login", response_model=Token)
@@ -63,7 +92,8 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
         )
 
 
-    if not verify_password(form_data.password, user.password_hash):
+    verified, new_hash = verify_and_update_password(form_data.password, user.password_hash)
+    if not verified:
         logger.warning(f"Login failed: Invalid password for user '{form_data.username}'")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -80,27 +110,37 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
 
     logger.info(f"Login successful for user: {form_data.username} (ID: {user.id})")
 
+    # Upgrade bcrypt (or outdated argon2) hashes while the password is at hand
+    if new_hash:
+        user.password_hash = new_hash
+        db.commit()
+
     # 5. Return token
     return {"access_token": access_token, "token_type": "bearer"}
 
 
 @user_router.get("/me", response_model=UserResponse)
 def get_me(current_user: User = Depends(get_current_user)):
-    return current_user
+    return construct(UserResponse, current_user)
 
 
 @user_router.get("/me/team", response_model=TeamResponse)
-def get_my_team(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):                                                     
+def get_my_team(current_user: User = Depends(get_current_user)):                                                     
       # Check if user is in a team                                                                                                                    
       if not current_user.team_id:                                                                                                                    
           raise HTTPException(status_code=404, detail="You are not in a team")                                                                        
                                                                                                                                                       
-      team = db.query(Team).filter(Team.id == current_user.team_id).first()                                                                           
-      return team    
+      # Loaded with the user by get_current_user
+      team = current_user.team
+      return construct(TeamResponse, team)
+
+# Columns of UserResponse, selected directly for the members list
+_MEMBER_COLUMNS = [getattr(User, field) for field in UserResponse.model_fields]
+
 
-@user_router.get("/me/team/members", response_model=List[UserResponse])
+@user_router.get("/me/team/members", response_model=List[UserResponse], response_class=ORJSONResponse)
 def get_my_team_members(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
         if not current_user.team_id:                                                                                                                    
           raise HTTPException(status_code=404, detail="You are not in a team")  
-        members=db.query(User).filter(User.team_id == current_user.team_id).all()
-        return members
\ No newline at end of file
+        members = db.execute(select(*_MEMBER_COLUMNS).where(User.team_id == current_user.team_id)).mappings()
+        return rows_response(members)
@@ -1,8 +1,14 @@
 """
 Encryption utilities for sensitive credentials.
-Uses Fernet symmetric encryption from the cryptography library.
+Uses AES-256-GCM from the cryptography library. Values written before
+the switch are Fernet tokens and are still decrypted with the same key.
 """
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 import os
 
 # Get encryption key from environment variable
@@ -14,8 +20,26 @@ if not CREDENTIALS_ENCRYPTION_KEY:
         "Generate one with: python -c \"from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())\""
     )
 
+# Legacy cipher, only used to read values stored before AES-GCM
 cipher = Fernet(CREDENTIALS_ENCRYPTION_KEY.encode())
 
+# AES-GCM key derived from the same secret, so no new key has to be deployed
+aesgcm = AESGCM(HKDF(
+    algorithm=hashes.SHA256(),
+    length=32,
+    salt=None,
+    info=b"infrautomater credentials aes-gcm v2",
+).derive(urlsafe_b64decode(CREDENTIALS_ENCRYPTION_KEY)))
+
+# Marks AES-GCM values; Fernet tokens always start with "gAAAAA"
+AESGCM_PREFIX = "v2:"
+NONCE_SIZE = 12
+
+
+def _encrypt(data: bytes) -> str:
+    nonce = os.urandom(NONCE_SIZE)
+    return AESGCM_PREFIX + urlsafe_b64encode(nonce + aesgcm.encrypt(nonce, data, None)).decode()
+
 
 def encrypt_credential(plaintext: str) -> str:
     """
@@ -29,7 +53,20 @@ def encrypt_credential(plaintext: str) -> str:
     """
     if not plaintext:
         return ""
-    return cipher.encrypt(plaintext.encode()).decode()
+    return _encrypt(plaintext.encode())
+
+
+def encrypt_many(plaintexts: list) -> list:
+    """
+    Encrypt several strings with the shared AES-GCM key.
+
+    Args:
+        plaintexts: Strings to encrypt; empty values stay empty
+
+    Returns:
+        List of Base64-encoded encrypted strings, in the same order
+    """
+    return [_encrypt(value.encode()) if value else "" for value in plaintexts]
 
 
 def decrypt_credential(ciphertext: str) -> str:
@@ -37,11 +74,16 @@ def decrypt_credential(ciphertext: str) -> str:
     Decrypt an encrypted string.
 
     Args:
-        ciphertext: Base64-encoded encrypted string
+        ciphertext: Base64-encoded encrypted string (AES-GCM or legacy Fernet)
 
     Returns:
         Decrypted plaintext string
     """
     if not ciphertext:
         return ""
-    return cipher.decrypt(ciphertext.encode()).decode()
+    if not ciphertext.startswith(AESGCM_PREFIX):
+        return cipher.decrypt(ciphertext.encode()).decode()
+
+    data = urlsafe_b64decode(ciphertext[len(AESGCM_PREFIX):])
+    return aesgcm.decrypt(data[:NONCE_SIZE], data[NONCE_SIZE:], None).decode()
+
@@ -0,0 +1,53 @@
+"""
+Conditional GET helpers for list endpoints.
+A collection's ETag is derived from its row count and newest updated_at,
+so a poll that finds nothing changed costs one aggregate query and an
+empty 304 instead of loading and serializing the page.
+"""
+from typing import Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+
+def collection_etag(query: Query, updated_column) -> str:
+    """
+    Compute a weak ETag for the rows matched by a query.
+
+    Args:
+        query: The filtered query backing the list endpoint
+        updated_column: The model's updated_at column
+
+    Returns:
+        Weak ETag string, e.g. W/"1718000000.123456-42"
+    """
+    newest, count = query.with_entities(func.max(updated_column), func.count()).one()
+    stamp = newest.timestamp() if newest else 0
+    return f'W/"{stamp}-{count}"'
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Answer a conditional GET.
+
+    Sets the ETag header on the outgoing response and, when the client's
+    If-None-Match already holds that ETag, returns a 304 to send instead.
+
+    Args:
+        request: The incoming request
+        response: The response FastAPI will send for the handler's result
+        etag: The current ETag of the collection
+
+    Returns:
+        A 304 response when the client copy is current, otherwise None
+    """
+    response.headers["ETag"] = etag
+
+    header = request.headers.get("if-none-match")
+    if header:
+        tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+        if "*" in tags or etag.removeprefix("W/") in tags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    return None
@@ -0,0 +1,46 @@
+"""
+Keyset pagination helpers for list endpoints.
+Pages are bounded by the primary key rather than OFFSET, so deep pages
+cost the same as the first one.
+"""
+from typing import Optional
+
+from sqlalchemy.orm import Query
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def keyset_page(
+    query: Query,
+    id_column,
+    limit: int,
+    cursor: Optional[int] = None,
+    descending: bool = False
+) -> dict:
+    """
+    Fetch one page of a query ordered by its primary key.
+
+    Args:
+        query: The filtered query to paginate
+        id_column: Primary key column used as the cursor
+        limit: Maximum number of items to return
+        cursor: next_cursor value from the previous page, if any
+        descending: Walk from newest to oldest id
+
+    Returns:
+        Dict with the page items and the cursor for the next page
+        (None when there are no more rows)
+    """
+    if cursor is not None:
+        query = query.filter(id_column < cursor if descending else id_column > cursor)
+
+    order = id_column.desc() if descending else id_column.asc()
+    rows = query.order_by(order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = getattr(rows[-1], id_column.key)
+
+    return {"items": rows, "next_cursor": next_cursor}
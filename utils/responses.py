@@ -0,0 +1,102 @@
+"""
+Response helpers for data that comes straight from the database.
+Handlers that select plain columns can return their rows directly as
+orjson-rendered responses, skipping ORM objects, Pydantic validation
+and jsonable_encoder; orjson serializes dicts, lists and datetimes
+natively. Unbounded lists are streamed in batches instead. Single ORM
+objects can be wrapped in their response model without re-validating
+fields the database already typed.
+"""
+from decimal import Decimal
+from typing import Any, Iterable, List, Type, TypeVar
+
+import orjson
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.engine import MappingResult
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+# Rows fetched and serialized per chunk of a streamed list
+STREAM_BATCH_SIZE = 500
+
+
+def _default(obj: Any) -> Any:
+    """
+    Encode the column types orjson has no native support for, the same
+    way jsonable_encoder does. datetime, date, UUID, enums and dataclasses
+    are handled natively and never reach this.
+    """
+    if isinstance(obj, Decimal):
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    raise TypeError
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default)
+
+
+def rows_response(rows: Iterable) -> ORJSONResponse:
+    """
+    Build a JSON array response from result mappings.
+
+    Args:
+        rows: Rows from `db.execute(select(...)).mappings()`
+
+    Returns:
+        ORJSONResponse with one object per row
+    """
+    content: List[dict] = [dict(row) for row in rows]
+    return ORJSONResponse(content)
+
+
+def stream_rows(result: MappingResult) -> StreamingResponse:
+    """
+    Stream result mappings as a JSON array, one batch of rows at a time.
+
+    The statement should be executed with `yield_per` so rows are fetched
+    from the database in batches too; the session stays open until the
+    body has been sent.
+
+    The 200 status and headers go out with the first batch. If fetching
+    a later batch fails, the client is left with a truncated, invalid
+    JSON array rather than an error response.
+
+    Args:
+        result: `db.execute(select(...).execution_options(yield_per=...)).mappings()`
+
+    Returns:
+        StreamingResponse with one object per row
+    """
+    def body():
+        separator = b"["
+        for rows in result.partitions(STREAM_BATCH_SIZE):
+            yield separator + b",".join(orjson.dumps(dict(row), default=_default) for row in rows)
+            separator = b","
+        yield b"]" if separator == b"," else b"[]"
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+def construct(model: Type[M], obj: Any) -> M:
+    """
+    Build a response model from a trusted ORM object without validation.
+
+    FastAPI passes an instance of the route's response_model through
+    unchanged, so the only remaining work is serializing it.
+
+    Args:
+        model: The response model class
+        obj: ORM object exposing every field of the model as an attribute
+
+    Returns:
+        Model instance built with model_construct
+    """
+    return model.model_construct(**{field: getattr(obj, field) for field in model.model_fields})